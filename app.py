@@ -1,14 +1,22 @@
 import os
 import json
+import atexit
+import functools
 import random
 import string
 import time
-import datetime
+import select
 import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
+import numpy as np
 from flask import Flask
 import psycopg2
+import psycopg2.extensions
 import psycopg2.extras
+import psycopg2.pool
 
 
 ###############################################################################
@@ -20,6 +28,22 @@ app = Flask(__name__)
 # Default to 0 if not found (for local dev).
 INSTANCE_INDEX = int(os.getenv("CF_INSTANCE_INDEX", "0"))
 
+# Idle back-off (seconds) between polls when no tasks are found.
+# Doubles on each empty poll up to the max; resets after a task is claimed.
+IDLE_SLEEP_MIN = 0.5
+IDLE_SLEEP_MAX = 30
+
+# After a claim finds nothing, skip the DB for this long (seconds). A 'tasks_new'
+# notification or a local insert clears it early.
+EMPTY_CACHE_SECONDS = 2.0
+
+# Number of tasks this instance processes concurrently.
+TASK_WORKERS = 8
+
+# How often (seconds) in-flight tasks get their lastupdatedtime refreshed, so the
+# stale sweep (1 minute) only fails tasks whose instance actually went away.
+HEARTBEAT_SECONDS = 20
+
 # Hard-coded fallback "VCAP_SERVICES" if not provided by environment.
 # Use this to run locally or if you don't bind a real service.
 FALLBACK_VCAP = {
@@ -38,10 +62,12 @@ FALLBACK_VCAP = {
 }
 
 
+@functools.lru_cache(maxsize=1)
 def parse_vcap_services():
     """
     Parse VCAP_SERVICES from environment or fallback to hard-coded.
     Returns a dict with keys: host, port, dbname, user, password.
+    The result is cached, so repeated calls don't re-parse the JSON.
     """
     vcap_json = os.getenv("VCAP_SERVICES")
     if not vcap_json:
@@ -67,6 +93,19 @@ DB_CONFIG = parse_vcap_services()
 if not DB_CONFIG:
     raise RuntimeError("Could not parse DB credentials from VCAP_SERVICES or fallback.")
 
+# Connection string built once and shared by the pool and the LISTEN connection.
+DSN = psycopg2.extensions.make_dsn(**DB_CONFIG)
+
+# Shared connection pool so each helper reuses an established session instead
+# of paying the TCP/TLS/auth handshake on every call. Sized so every task worker,
+# the processor loop and the heartbeat can hold a connection at once (the pool
+# doesn't block). minconn must match maxconn: psycopg2 only keeps a returned
+# connection while fewer than minconn are idle and closes the rest, so a smaller
+# minconn would reconnect whenever several tasks finish together.
+POOL_SIZE = TASK_WORKERS + 2
+POOL = psycopg2.pool.ThreadedConnectionPool(POOL_SIZE, POOL_SIZE, DSN)
+atexit.register(POOL.closeall)
+
 
 ###############################################################################
 # 2) PostgreSQL Table Setup and Queries
@@ -84,6 +123,45 @@ CREATE TABLE IF NOT EXISTS tasks (
     lastupdatedtime TIMESTAMP,
     errorDesc VARCHAR(255)
 );
+-- Earlier index layouts (the full claim index and partial indexes that repeated
+-- their constant WHERE columns); every status change paid for each of them.
+DROP INDEX IF EXISTS tasks_claim_idx;
+DROP INDEX IF EXISTS tasks_ready;
+DROP INDEX IF EXISTS tasks_stale;
+CREATE INDEX IF NOT EXISTS tasks_ready_seq
+    ON tasks (fileseqno)
+    WHERE status = 'NOT_STARTED' AND ignoreIndicator = false;
+CREATE INDEX IF NOT EXISTS tasks_stale_time
+    ON tasks (lastupdatedtime)
+    WHERE status = 'IN_PROGRESS';
+"""
+
+# Transaction-scoped advisory lock taken before the DDL below, so instances that
+# start together run schema setup one at a time (the IF NOT EXISTS checks and
+# CREATE OR REPLACE FUNCTION are not safe to race).
+SCHEMA_LOCK_SQL = "SELECT pg_advisory_xact_lock(hashtext('tasks_schema'))"
+
+# Wake idle workers as soon as new tasks are inserted (one NOTIFY per statement).
+CREATE_NOTIFY_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION notify_task() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('tasks_new', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_trigger
+        WHERE tgname = 't_notify' AND tgrelid = 'tasks'::regclass
+    ) THEN
+        CREATE TRIGGER t_notify
+            AFTER INSERT ON tasks
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_task();
+    END IF;
+END;
+$$;
 """
 
 INSERT_SQL = """
@@ -96,74 +174,121 @@ INSERT INTO tasks (
     filesize,
     lastupdatedtime,
     errorDesc
-) VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+) VALUES %s
 """
 
-SELECT_TASKS_SQL = """
-SELECT *
-FROM tasks
-WHERE
-    status = 'NOT_STARTED'
-    AND ignoreIndicator = false
-ORDER BY fileseqno
-"""
+# Per-row template for execute_values; lastupdatedtime is filled in by the server.
+INSERT_ROW_TEMPLATE = "(%s, %s, %s, %s, %s, %s, NOW(), %s)"
 
-UPDATE_IN_PROGRESS_SQL = """
+CLAIM_TASKS_SQL = """
 UPDATE tasks
 SET
     status = 'IN_PROGRESS',
-    lastupdatedtime = %s
-WHERE fileseqno = %s
+    lastupdatedtime = now()
+WHERE fileseqno IN (
+    SELECT fileseqno
+    FROM tasks
+    WHERE
+        status = 'NOT_STARTED'
+        AND ignoreIndicator = false
+        AND (groupid = $1 OR trancheid = $1)
+    ORDER BY fileseqno
+    LIMIT $2
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING fileseqno
 """
 
 UPDATE_FINAL_SQL = """
 UPDATE tasks
 SET
-    status = %s,
-    lastupdatedtime = %s,
-    errorDesc = %s
-WHERE fileseqno = %s
-"""
-
-SELECT_STALE_TASKS_SQL = """
-SELECT * FROM tasks
-WHERE status = 'IN_PROGRESS'
-  AND lastupdatedtime < %s
+    status = $1,
+    lastupdatedtime = now(),
+    errorDesc = $2
+WHERE fileseqno = $3
 """
 
-UPDATE_STALE_SQL = """
+MARK_STALE_SQL = """
 UPDATE tasks
 SET
     status = 'FAILED',
     errorDesc = 'Instance down or did not process in time'
-WHERE fileseqno = %s
+WHERE status = 'IN_PROGRESS'
+  AND lastupdatedtime < now() - interval '1 minute'
+RETURNING fileseqno
+"""
+
+HEARTBEAT_SQL = """
+UPDATE tasks
+SET lastupdatedtime = now()
+WHERE status = 'IN_PROGRESS'
+  AND fileseqno = ANY(%s)
 """
 
+# Hot statements are prepared once per pooled connection (server-side), so each
+# call skips parse + plan and just runs EXECUTE <name>(...).
+PREPARED_STATEMENTS = {
+    "claim_tasks": CLAIM_TASKS_SQL,
+    "update_final": UPDATE_FINAL_SQL,
+    "mark_stale": MARK_STALE_SQL,
+}
+
+CLAIM_TASKS_EXEC = "EXECUTE claim_tasks(%s, %s)"
+UPDATE_FINAL_EXEC = "EXECUTE update_final(%s, %s, %s)"
+MARK_STALE_EXEC = "EXECUTE mark_stale"
+
+# Pooled connections that already hold PREPARED_STATEMENTS.
+_PREPARED_CONNS = weakref.WeakSet()
+
 
-def get_connection():
+def prepare_statements(conn):
     """
-    Create a new PostgreSQL connection using DB_CONFIG.
+    PREPARE the hot statements on a freshly checked-out connection
+    (all in one round-trip).
     """
-    return psycopg2.connect(
-        host=DB_CONFIG["host"],
-        port=DB_CONFIG["port"],
-        dbname=DB_CONFIG["dbname"],
-        user=DB_CONFIG["user"],
-        password=DB_CONFIG["password"]
-    )
+    with conn.cursor() as cur:
+        cur.execute("; ".join(
+            f"PREPARE {name} AS {sql}" for name, sql in PREPARED_STATEMENTS.items()
+        ))
+    conn.commit()
+    _PREPARED_CONNS.add(conn)
 
 
-def create_table():
+@contextmanager
+def get_connection(autocommit=False, prepare=True):
     """
-    Create the 'tasks' table if it doesn't already exist.
+    Check out a PostgreSQL connection from POOL and return it when done.
+    With autocommit=True each statement commits on its own, saving the extra
+    COMMIT round-trip; use it only for single-statement helpers.
+    With prepare=False PREPARED_STATEMENTS are not set up on this checkout;
+    schema setup needs that, since they reference the table it creates.
     """
-    conn = get_connection()
+    conn = POOL.getconn()
     try:
+        conn.autocommit = autocommit
+        if prepare and conn not in _PREPARED_CONNS:
+            prepare_statements(conn)
+        yield conn
+    finally:
+        if autocommit and not conn.closed:
+            conn.autocommit = False
+        POOL.putconn(conn)
+
+
+def create_table():
+    """
+    Create the 'tasks' table (and its insert-notify trigger) if it doesn't already exist.
+    """
+    with get_connection(prepare=False) as conn:
         with conn.cursor() as cur:
+            cur.execute(SCHEMA_LOCK_SQL)
             cur.execute(CREATE_TABLE_SQL)
+            cur.execute(CREATE_NOTIFY_TRIGGER_SQL)
         conn.commit()
-    finally:
-        conn.close()
+
+
+# time.monotonic() until which task_processor_loop assumes there is nothing to claim.
+_empty_until = 0.0
 
 
 def insert_synthetic_data(num_records=10):
@@ -173,84 +298,77 @@ def insert_synthetic_data(num_records=10):
     - status is 'NOT_STARTED' so they are eligible for processing.
     - ignoreIndicator = false so we don't skip them.
     """
-    conn = get_connection()
-    try:
+    global _empty_until
+
+    # Generate every column as a NumPy batch instead of per-row Python calls.
+    # .tolist() hands psycopg2 plain Python ints/strs (it can't adapt NumPy scalars).
+    groupids = np.random.randint(0, 3, num_records).tolist()
+    trancheids = np.random.randint(0, 3, num_records).tolist()
+    filesizes = np.random.randint(1000, 5001, num_records).tolist()
+    letters = np.frombuffer(string.ascii_lowercase.encode(), dtype='|S1')
+    names = np.random.choice(letters, size=(num_records, 8)).view('|S8').ravel()
+    filenames = np.char.add(names.astype(str), ".txt").tolist()
+
+    status = 'NOT_STARTED'
+    ignore_indicator = False
+    errorDesc = None
+
+    rows = [
+        (
+            groupid,
+            trancheid,
+            filename,
+            status,
+            ignore_indicator,
+            filesize,
+            errorDesc
+        )
+        for groupid, trancheid, filename, filesize
+        in zip(groupids, trancheids, filenames, filesizes)
+    ]
+
+    with get_connection() as conn:
         with conn.cursor() as cur:
-            for _ in range(num_records):
-                groupid = random.randint(0, 2)
-                trancheid = random.randint(0, 2)
-                filename = ''.join(random.choices(string.ascii_lowercase, k=8)) + ".txt"
-                status = 'NOT_STARTED'
-                ignore_indicator = False
-                filesize = random.randint(1000, 5000)
-                lastupdatedtime = datetime.datetime.now()
-                errorDesc = None
-
-                cur.execute(INSERT_SQL, (
-                    groupid,
-                    trancheid,
-                    filename,
-                    status,
-                    ignore_indicator,
-                    filesize,
-                    lastupdatedtime,
-                    errorDesc
-                ))
+            # One multi-row INSERT per page instead of one round-trip per row
+            psycopg2.extras.execute_values(
+                cur, INSERT_SQL, rows, template=INSERT_ROW_TEMPLATE, page_size=500
+            )
         conn.commit()
-    finally:
-        conn.close()
 
-
-def select_tasks_for_instance():
-    """
-    1. Select tasks where status = 'NOT_STARTED' and ignoreIndicator = false.
-    2. Filter tasks by groupid == INSTANCE_INDEX OR trancheid == INSTANCE_INDEX.
-    3. Return them in ascending order of fileseqno.
-    """
-    conn = get_connection()
-    rows = []
-    try:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(SELECT_TASKS_SQL)
-            all_tasks = cur.fetchall()
-            # Filter tasks for this instance
-            tasks_for_this_instance = [
-                row for row in all_tasks
-                if row["groupid"] == INSTANCE_INDEX or row["trancheid"] == INSTANCE_INDEX
-            ]
-            rows = tasks_for_this_instance
-    finally:
-        conn.close()
-    return rows
+    # New tasks exist, so don't trust a cached empty claim
+    _empty_until = 0.0
 
 
-def mark_in_progress(fileseqno):
+def claim_tasks(batch=5):
     """
-    Set task status to 'IN_PROGRESS' and update lastupdatedtime = now.
+    Atomically claim up to `batch` NOT_STARTED tasks for this instance
+    (groupid == INSTANCE_INDEX OR trancheid == INSTANCE_INDEX), marking them
+    IN_PROGRESS in the same statement. Rows locked by another instance are
+    skipped, so concurrent instances never claim the same task.
+    Returns the claimed fileseqnos in ascending order.
+    An empty result is remembered for EMPTY_CACHE_SECONDS (see _empty_until);
+    task_processor_loop skips whole polls until then.
     """
-    conn = get_connection()
-    try:
+    global _empty_until
+    with get_connection(autocommit=True) as conn:
         with conn.cursor() as cur:
-            cur.execute(UPDATE_IN_PROGRESS_SQL, (datetime.datetime.now(), fileseqno))
-        conn.commit()
-    finally:
-        conn.close()
+            cur.execute(CLAIM_TASKS_EXEC, (INSTANCE_INDEX, batch))
+            fileseqnos = sorted(fileseqno for (fileseqno,) in cur)
+    if not fileseqnos:
+        _empty_until = time.monotonic() + EMPTY_CACHE_SECONDS
+    return fileseqnos
 
 
 def mark_final_status(fileseqno, final_status, error_desc=None):
     """
     Mark task as 'SUCCESS' or 'FAILED' with updated timestamp and optional errorDesc.
     """
-    conn = get_connection()
-    try:
+    with get_connection(autocommit=True) as conn:
         with conn.cursor() as cur:
             cur.execute(
-                UPDATE_FINAL_SQL,
-                (final_status, datetime.datetime.now(), error_desc, fileseqno)
+                UPDATE_FINAL_EXEC,
+                (final_status, error_desc, fileseqno)
             )
-        conn.commit()
-    finally:
-        conn.close()
 
 
 def mark_stale_tasks():
@@ -258,66 +376,175 @@ def mark_stale_tasks():
     If a task is IN_PROGRESS but hasn't been updated in over 1 minute,
     mark it as FAILED (instance presumably down).
     """
-    one_min_ago = datetime.datetime.now() - datetime.timedelta(minutes=1)
-    conn = get_connection()
-    try:
-        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-            cur.execute(SELECT_STALE_TASKS_SQL, (one_min_ago,))
-            stale_tasks = cur.fetchall()
-            for task in stale_tasks:
-                fileseqno = task["fileseqno"]
-                print(f"[ALERT] Task {fileseqno} is stale. Marking as FAILED.")
-                cur.execute(UPDATE_STALE_SQL, (fileseqno,))
-        conn.commit()
-    finally:
-        conn.close()
+    with get_connection(autocommit=True) as conn:
+        with conn.cursor() as cur:
+            cur.execute(MARK_STALE_EXEC)
+            stale_ids = [r[0] for r in cur.fetchall()]
+
+    for fileseqno in stale_ids:
+        print(f"[ALERT] Task {fileseqno} is stale. Marked as FAILED.")
 
 
 ###############################################################################
 # 3) Background Simulation (Task Processor Loop)
 ###############################################################################
+def open_listen_connection():
+    """
+    Open a dedicated autocommit connection subscribed to the 'tasks_new' channel.
+    It is held for the lifetime of the loop, so it is kept out of POOL.
+    """
+    conn = psycopg2.connect(DSN)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("LISTEN tasks_new")
+    return conn
+
+
+def wait_for_new_tasks(listen_conn, timeout):
+    """
+    Block until a 'tasks_new' notification arrives or `timeout` seconds pass.
+    Returns True if woken by a notification (which also clears the empty-claim cache).
+    """
+    global _empty_until
+    if select.select([listen_conn], [], [], timeout) == ([], [], []):
+        return False
+    listen_conn.poll()
+    listen_conn.notifies.clear()
+    _empty_until = 0.0
+    return True
+
+
+# Tasks claimed by this instance and not yet finalized (covered by the heartbeat).
+IN_FLIGHT_IDS = set()
+IN_FLIGHT_LOCK = threading.Lock()
+
+
+def heartbeat_loop():
+    """
+    Every HEARTBEAT_SECONDS, refresh lastupdatedtime for all in-flight tasks
+    with a single UPDATE (one round-trip regardless of how many are running).
+    """
+    while True:
+        time.sleep(HEARTBEAT_SECONDS)
+        with IN_FLIGHT_LOCK:
+            ids = list(IN_FLIGHT_IDS)
+        if not ids:
+            continue
+        try:
+            with get_connection(autocommit=True) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(HEARTBEAT_SQL, (ids,))
+        except psycopg2.Error as e:
+            print(f"[Instance {INSTANCE_INDEX}] Heartbeat failed: {e}")
+
+
+# Task work is I/O-bound, so overlap it across threads. The semaphore counts free
+# workers; the loop reserves slots before claiming so it never holds claimed rows
+# (which other instances can't take) that no worker can start yet.
+EXECUTOR = ThreadPoolExecutor(max_workers=TASK_WORKERS)
+SEM = threading.Semaphore(TASK_WORKERS)
+
+
+def reserve_worker_slots(max_slots):
+    """
+    Block until at least one worker is free, then take any other free ones,
+    up to max_slots. Returns the number of slots reserved.
+    """
+    SEM.acquire()
+    slots = 1
+    while slots < max_slots and SEM.acquire(blocking=False):
+        slots += 1
+    return slots
+
+
+def process_one_task(fileseqno):
+    """
+    Sleep a random amount to simulate work, then mark the task SUCCESS/FAILED.
+    """
+    try:
+        # Simulate random processing time
+        delay = random.randint(5, 10)
+        print(f"[Instance {INSTANCE_INDEX}] Processing task {fileseqno} for {delay}s...")
+        time.sleep(delay)
+
+        # Randomly decide success/fail (80% success)
+        if random.random() < 0.8:
+            mark_final_status(fileseqno, "SUCCESS", "No Error")
+            print(f"[Instance {INSTANCE_INDEX}] Task {fileseqno} SUCCESS.")
+        else:
+            mark_final_status(fileseqno, "FAILED", "Simulated error.")
+            print(f"[Instance {INSTANCE_INDEX}] Task {fileseqno} FAILED.")
+    finally:
+        with IN_FLIGHT_LOCK:
+            IN_FLIGHT_IDS.discard(fileseqno)
+
+
+def on_task_done(future):
+    """
+    Free the worker slot and report any error raised by process_one_task.
+    """
+    SEM.release()
+    if future.exception() is not None:
+        print(f"[Instance {INSTANCE_INDEX}] Task worker error: {future.exception()}")
+
+
 def task_processor_loop():
     """
     Continuously:
+    0. If the last claim came back empty less than EMPTY_CACHE_SECONDS ago,
+       just wait out the rest of that window (or until notified).
     1. Mark stale tasks as FAILED if they're IN_PROGRESS longer than 1 minute.
-    2. Fetch tasks that this instance should process.
-    3. Mark them IN_PROGRESS, sleep a random amount, then mark SUCCESS/FAILED.
-    4. Repeat.
+    2. Claim as many tasks as there are free workers (marks them IN_PROGRESS).
+       If there are none, wait for a 'tasks_new' notification, backing off
+       exponentially (IDLE_SLEEP_MIN..IDLE_SLEEP_MAX) across empty polls.
+    3. Hand each task to EXECUTOR (one reserved worker slot each); claimed tasks
+       stay fresh via heartbeat_loop until they are finalized.
+    4. Repeat immediately.
     """
     print(f"[Instance {INSTANCE_INDEX}] Starting task processor loop...")
+    listen_conn = open_listen_connection()
+    idle_sleep = IDLE_SLEEP_MIN
     while True:
+        # While the last empty claim is still cached, skip the whole poll (stale
+        # sweep included) without touching the back-off; a notification clears
+        # the cache and ends the wait early.
+        remaining = _empty_until - time.monotonic()
+        if remaining > 0:
+            if wait_for_new_tasks(listen_conn, remaining):
+                idle_sleep = IDLE_SLEEP_MIN
+            continue
+
         # 1) Mark stale tasks
         mark_stale_tasks()
 
-        # 2) Fetch tasks for this instance
-        tasks_to_process = select_tasks_for_instance()
+        # 2) Wait for free workers, then claim only as many tasks as they can start
+        slots = reserve_worker_slots(TASK_WORKERS)
+        tasks_to_process = []
+        try:
+            tasks_to_process = claim_tasks(batch=slots)
+        finally:
+            # Give back the slots the claim didn't fill
+            if slots > len(tasks_to_process):
+                SEM.release(slots - len(tasks_to_process))
         if not tasks_to_process:
-            print(f"[Instance {INSTANCE_INDEX}] No tasks to process. Sleeping 10s...")
-            time.sleep(10)
+            print(f"[Instance {INSTANCE_INDEX}] No tasks to process. Waiting up to {idle_sleep}s for new tasks...")
+            if wait_for_new_tasks(listen_conn, idle_sleep):
+                idle_sleep = IDLE_SLEEP_MIN
+            else:
+                idle_sleep = min(IDLE_SLEEP_MAX, idle_sleep * 2)
             continue
 
-        # 3) Process each task
-        for task in tasks_to_process:
-            fileseqno = task["fileseqno"]
-            print(f"[Instance {INSTANCE_INDEX}] Acquired task fileseqno={fileseqno}")
-
-            mark_in_progress(fileseqno)
-
-            # Simulate random processing time
-            delay = random.randint(5, 10)
-            print(f"[Instance {INSTANCE_INDEX}] Processing task {fileseqno} for {delay}s...")
-            time.sleep(delay)
+        idle_sleep = IDLE_SLEEP_MIN
+        with IN_FLIGHT_LOCK:
+            IN_FLIGHT_IDS.update(tasks_to_process)
 
-            # Randomly decide success/fail (80% success)
-            if random.random() < 0.8:
-                mark_final_status(fileseqno, "SUCCESS", "No Error")
-                print(f"[Instance {INSTANCE_INDEX}] Task {fileseqno} SUCCESS.")
-            else:
-                mark_final_status(fileseqno, "FAILED", "Simulated error.")
-                print(f"[Instance {INSTANCE_INDEX}] Task {fileseqno} FAILED.")
+        # 3) Dispatch each task (its worker slot is already reserved)
+        for fileseqno in tasks_to_process:
+            print(f"[Instance {INSTANCE_INDEX}] Acquired task fileseqno={fileseqno}")
+            EXECUTOR.submit(process_one_task, fileseqno).add_done_callback(on_task_done)
 
-        print(f"[Instance {INSTANCE_INDEX}] Finished a batch of tasks. Sleeping 5s...")
-        time.sleep(5)
+        # Poll again right away; only back off once a poll comes back empty.
+        print(f"[Instance {INSTANCE_INDEX}] Dispatched a batch of tasks. Polling again...")
 
 
 ###############################################################################
@@ -344,6 +571,10 @@ def main():
     thread = threading.Thread(target=task_processor_loop, daemon=True)
     thread.start()
 
+    # Keep in-flight tasks from being swept as stale
+    heartbeat = threading.Thread(target=heartbeat_loop, daemon=True)
+    heartbeat.start()
+
     # Run the Flask app
     port = int(os.getenv("PORT", 8080))
     app.run(host="0.0.0.0", port=port)
@@ -1,5 +1,5 @@
 import os
-import datetime
+import atexit
 import pandas as pd
 import oracledb  # or: import cx_Oracle as oracledb
 
@@ -24,13 +24,19 @@ CF_INSTANCE_INDEX = int(os.getenv("CF_INSTANCE_INDEX", "0"))
 ###############################################################################
 # 2) Connect to Oracle
 ###############################################################################
+POOL = oracledb.create_pool(
+    user=ORACLE_USER,
+    password=ORACLE_PASSWORD,
+    dsn=ORACLE_DSN,
+    min=2,
+    max=10,
+    increment=1,
+    getmode=oracledb.POOL_GETMODE_WAIT
+)
+atexit.register(POOL.close)
+
 def get_oracle_connection():
-    connection = oracledb.connect(
-        user=ORACLE_USER,
-        password=ORACLE_PASSWORD,
-        dsn=ORACLE_DSN
-    )
-    return connection
+    return POOL.acquire()
 
 ###############################################################################
 # 3) Create Table If Not Exists (including FACILITYID)
@@ -62,9 +68,86 @@ EXCEPTION
 END;
 """
 
+# Backs the worker's claim query (groupid = :g AND status = 'NOT_STARTED' ORDER BY fileseqno).
+CREATE_GRP_STATUS_INDEX_SQL = """
+BEGIN
+    EXECUTE IMMEDIATE '
+        CREATE INDEX tasks_grp_status ON tasks (groupid, status, fileseqno)
+    ';
+EXCEPTION
+    WHEN OTHERS THEN
+        IF SQLCODE = -955 THEN
+            -- ORA-00955: name is already used by an existing object => index exists
+            NULL;
+        ELSE
+            RAISE;
+        END IF;
+END;
+"""
+
+# Backs the stale-task sweep (status = 'IN_PROGRESS' AND lastupdatedtime < :cutoff).
+CREATE_STUCK_INDEX_SQL = """
+BEGIN
+    EXECUTE IMMEDIATE '
+        CREATE INDEX tasks_stuck ON tasks (status, lastupdatedtime)
+    ';
+EXCEPTION
+    WHEN OTHERS THEN
+        IF SQLCODE = -955 THEN
+            -- ORA-00955: name is already used by an existing object => index exists
+            NULL;
+        ELSE
+            RAISE;
+        END IF;
+END;
+"""
+
+# Backs the anti-join that skips candidates already present in tasks.
+CREATE_DEDUP_INDEX_SQL = """
+BEGIN
+    EXECUTE IMMEDIATE '
+        CREATE INDEX tasks_dedup ON tasks (facilityid, trancheid, filename, groupid)
+    ';
+EXCEPTION
+    WHEN OTHERS THEN
+        IF SQLCODE = -955 THEN
+            -- ORA-00955: name is already used by an existing object => index exists
+            NULL;
+        ELSE
+            RAISE;
+        END IF;
+END;
+"""
+
+# Session-private staging area for candidate rows read from Excel.
+# Rows vanish on commit, so a pooled session never sees a previous run's data.
+CREATE_STAGING_TABLE_SQL = """
+BEGIN
+    EXECUTE IMMEDIATE '
+        CREATE GLOBAL TEMPORARY TABLE tasks_staging (
+            facilityid VARCHAR2(100),
+            trancheid INT,
+            filename VARCHAR2(100)
+        ) ON COMMIT DELETE ROWS
+    ';
+EXCEPTION
+    WHEN OTHERS THEN
+        IF SQLCODE = -955 THEN
+            -- ORA-00955: name is already used by an existing object => table exists
+            NULL;
+        ELSE
+            RAISE;
+        END IF;
+END;
+"""
+
 def create_tasks_table_if_not_exists(conn):
     with conn.cursor() as cur:
         cur.execute(CREATE_TABLE_SQL)
+        cur.execute(CREATE_GRP_STATUS_INDEX_SQL)
+        cur.execute(CREATE_STUCK_INDEX_SQL)
+        cur.execute(CREATE_DEDUP_INDEX_SQL)
+        cur.execute(CREATE_STAGING_TABLE_SQL)
     conn.commit()
 
 ###############################################################################
@@ -73,9 +156,16 @@ def create_tasks_table_if_not_exists(conn):
 def read_excel_data():
     """
     Loads the two sheets from the Excel file into pandas DataFrames.
+    The workbook is opened once for both sheets; pandas' openpyxl engine
+    already loads it read-only (streaming rows) with cached values only.
     """
-    df_facility = pd.read_excel(EXCEL_FILE_PATH, sheet_name=FACILITY_DOC_SHEET)
-    df_obligor = pd.read_excel(EXCEL_FILE_PATH, sheet_name=OBLIGOR_DATA_SHEET)
+    sheets = pd.read_excel(
+        EXCEL_FILE_PATH,
+        sheet_name=[FACILITY_DOC_SHEET, OBLIGOR_DATA_SHEET],
+        engine="openpyxl"
+    )
+    df_facility = sheets[FACILITY_DOC_SHEET]
+    df_obligor = sheets[OBLIGOR_DATA_SHEET]
 
     # If the second sheet calls it "Internal Credit Facility Id",
     # rename it to "InternalCreditFacilityID" to match the first sheet
@@ -91,18 +181,19 @@ def read_excel_data():
     return df_facility, df_obligor
 
 ###############################################################################
-# 5) Merge & Identify Fresh Rows
+# 5) Merge & Build Candidate Rows
 ###############################################################################
-def merge_sheets_and_find_fresh(df_facility, df_obligor, conn):
+def merge_sheets_and_find_fresh(df_facility, df_obligor):
     """
     Merges the two DataFrames on 'InternalCreditFacilityID' 
-    and identifies which rows haven't yet been inserted into the tasks table.
+    and builds the candidate rows for the tasks table. Rows already present
+    in tasks are filtered out server-side by insert_fresh_records.
     
     We'll assume each row needs:
       - FACILITYID (derived from the facility sheet or the internal ID)
       - TRANCHEID  (from df_obligor's 'TRANCHE_ID' column)
       - FILENAME   (from df_facility's 'FileName' column)
-      - GROUPID    (PCF instance index)
+      - GROUPID    (PCF instance index, added at insert time)
     """
 
     merged_df = pd.merge(
@@ -116,44 +207,23 @@ def merge_sheets_and_find_fresh(df_facility, df_obligor, conn):
     # df_obligor has "TRANCHE_ID" and "InternalCreditFacilityID".
     # If there's a separate "FacilityID" column, rename or unify it below.
 
-    existing_set = set()
-    with conn.cursor() as cur:
-        # We'll check uniqueness by (facilityid, trancheid, filename, groupid).
-        cur.execute("""
-            SELECT facilityid, trancheid, filename, groupid
-              FROM tasks
-        """)
-        for row in cur:
-            # row = (facilityid, trancheid, filename, groupid)
-            existing_set.add(row)
-
-    fresh_records = []
-    for _, row in merged_df.iterrows():
-        # Let's define how to derive each column:
-        facility_id = str(row["InternalCreditFacilityID"])
-        
-        # If the facility sheet itself has a separate "FacilityID" column, 
-        # use that instead. For now, we assume "InternalCreditFacilityID" = "FacilityID".
-        
-        tranche_id = row.get("TRANCHE_ID", None)
-        if pd.isna(tranche_id):
-            tranche_id = 0  # Or handle differently if missing
-
-        filename = row.get("FileName", None)
-        if pd.isna(filename):
-            filename = None
-
-        # Build the key to see if it's already inserted
-        key = (facility_id, tranche_id, filename, CF_INSTANCE_INDEX)
-        if key in existing_set:
-            # Already inserted
-            continue
-        
-        fresh_records.append({
-            "facilityid": facility_id,
-            "trancheid": int(tranche_id) if tranche_id else 0,
-            "filename": filename,
-        })
+    # Derive each column with vectorized ops rather than boxing every row.
+    # If the facility sheet itself has a separate "FacilityID" column,
+    # use that instead. For now, we assume "InternalCreditFacilityID" = "FacilityID".
+    candidates = pd.DataFrame({
+        "facilityid": merged_df["InternalCreditFacilityID"].astype(str),
+        # Missing tranche => 0 (or handle differently if needed)
+        "trancheid": (
+            merged_df["TRANCHE_ID"].fillna(0).astype("int64")
+            if "TRANCHE_ID" in merged_df.columns else 0
+        ),
+        "filename": (
+            merged_df["FileName"].astype(object).where(merged_df["FileName"].notna(), None)
+            if "FileName" in merged_df.columns else None
+        ),
+    })
+
+    fresh_records = candidates.to_dict("records")
 
     return fresh_records
 
@@ -162,7 +232,8 @@ def merge_sheets_and_find_fresh(df_facility, df_obligor, conn):
 ###############################################################################
 def insert_fresh_records(fresh_records, conn):
     """
-    Inserts the new tasks into the Oracle table, setting:
+    Stages the candidate rows in tasks_staging, then inserts the ones not yet
+    present in tasks (by facilityid, trancheid, filename, groupid), setting:
       groupid        => CF_INSTANCE_INDEX (PCF instance)
       facilityid     => from record
       trancheid      => from record
@@ -172,9 +243,23 @@ def insert_fresh_records(fresh_records, conn):
       filesize       => 0
       lastupdatedtime => now
       errordesc      => NULL
+    Returns the number of rows inserted.
+    """
+
+    sql_stage = """
+        INSERT INTO tasks_staging (
+            facilityid,
+            trancheid,
+            filename
+        ) VALUES (
+            :facilityid,
+            :trancheid,
+            :filename
+        )
     """
 
-    sql = """
+    # Anti-join against tasks so deduplication happens in the database
+    sql_insert = """
         INSERT INTO tasks (
             groupid,
             facilityid,
@@ -185,61 +270,57 @@ def insert_fresh_records(fresh_records, conn):
             filesize,
             lastupdatedtime,
             errordesc
-        ) VALUES (
-            :groupid,
-            :facilityid,
-            :trancheid,
-            :filename,
-            :status,
-            :ignoreind,
-            :filesize,
-            :lastupdate,
-            :errdesc
         )
+        SELECT :groupid,
+               s.facilityid,
+               s.trancheid,
+               s.filename,
+               'NOT_STARTED',
+               0,  -- 0 => false
+               0,  -- Could parse from filename if needed
+               CAST(SYSTIMESTAMP AS TIMESTAMP),
+               NULL
+          FROM tasks_staging s
+         WHERE NOT EXISTS (
+                SELECT 1
+                  FROM tasks t
+                 WHERE t.facilityid = s.facilityid
+                   AND t.trancheid = s.trancheid
+                   AND DECODE(t.filename, s.filename, 1, 0) = 1
+                   AND t.groupid = :groupid
+               )
     """
 
-    now = datetime.datetime.now()
-
     with conn.cursor() as cur:
-        for rec in fresh_records:
-            cur.execute(sql, {
-                "groupid": CF_INSTANCE_INDEX,
-                "facilityid": rec["facilityid"],
-                "trancheid": rec["trancheid"],
-                "filename": rec["filename"],
-                "status": "NOT_STARTED",
-                "ignoreind": 0,  # 0 => false
-                "filesize": 0,   # Could parse from filename if needed
-                "lastupdate": now,
-                "errdesc": None
-            })
+        # Single array-bound execute instead of one round-trip per row
+        cur.executemany(sql_stage, fresh_records)
+        cur.execute(sql_insert, {"groupid": CF_INSTANCE_INDEX})
+        inserted = cur.rowcount
     conn.commit()
+    return inserted
 
 ###############################################################################
 # 7) Main: Putting It All Together
 ###############################################################################
 def main():
-    conn = get_oracle_connection()
-    try:
+    with get_oracle_connection() as conn:
         # 1) Create the tasks table if it doesn't exist (includes facilityid column).
         create_tasks_table_if_not_exists(conn)
 
         # 2) Read the Excel sheets into DataFrames.
         df_facility, df_obligor = read_excel_data()
 
-        # 3) Merge them, find which records are fresh vs. already in tasks.
-        fresh_records = merge_sheets_and_find_fresh(df_facility, df_obligor, conn)
+        # 3) Merge them into candidate rows.
+        fresh_records = merge_sheets_and_find_fresh(df_facility, df_obligor)
         if not fresh_records:
             print("No new records to insert.")
             return
         
-        print(f"Found {len(fresh_records)} fresh records. Inserting into tasks...")
-        # 4) Insert the new tasks
-        insert_fresh_records(fresh_records, conn)
+        print(f"Found {len(fresh_records)} candidate records. Inserting fresh ones into tasks...")
+        # 4) Insert the tasks not already present
+        inserted = insert_fresh_records(fresh_records, conn)
 
-        print(f"Inserted {len(fresh_records)} new rows into 'tasks'.")
-    finally:
-        conn.close()
+        print(f"Inserted {inserted} new rows into 'tasks'.")
 
 if __name__ == "__main__":
     main()
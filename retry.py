@@ -1,17 +1,27 @@
 import os
-import datetime
+import atexit
 import oracledb  # or cx_Oracle
 
 ORACLE_DSN = os.getenv("ORACLE_DSN", "myhost:1521/myservice")
 ORACLE_USER = os.getenv("ORACLE_USER", "myuser")
 ORACLE_PASSWORD = os.getenv("ORACLE_PASSWORD", "mypassword")
 
+POOL = oracledb.create_pool(
+    user=ORACLE_USER,
+    password=ORACLE_PASSWORD,
+    dsn=ORACLE_DSN,
+    min=2,
+    max=10,
+    increment=1,
+    getmode=oracledb.POOL_GETMODE_WAIT
+)
+atexit.register(POOL.close)
+
 def get_oracle_connection():
-    return oracledb.connect(
-        user=ORACLE_USER,
-        password=ORACLE_PASSWORD,
-        dsn=ORACLE_DSN
-    )
+    # Single-statement script: commit with the statement, no separate round-trip
+    conn = POOL.acquire()
+    conn.autocommit = True
+    return conn
 
 def reassign_stale_tasks(conn):
     """
@@ -24,20 +34,16 @@ def reassign_stale_tasks(conn):
            SET groupid = 0,
                status = 'NOT_STARTED',
                errordesc = 'Reassigned by retry script',
-               lastupdatedtime = :now
+               lastupdatedtime = CAST(SYSTIMESTAMP AS TIMESTAMP)
          WHERE groupid = 9999
     """
     with conn.cursor() as cur:
-        cur.execute(sql, {"now": datetime.datetime.now()})
-    conn.commit()
+        cur.execute(sql)
 
 def main():
-    conn = get_oracle_connection()
-    try:
+    with get_oracle_connection() as conn:
         reassign_stale_tasks(conn)
         print("Stale tasks reassigned to groupid=0, status=NOT_STARTED.")
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     main()
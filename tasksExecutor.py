@@ -1,6 +1,8 @@
 import os
 import time
-import datetime
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import random  # For simulation of success/failure
 import oracledb  # or "import cx_Oracle as oracledb"
 
@@ -17,65 +19,104 @@ CF_INSTANCE_INDEX = int(os.getenv("CF_INSTANCE_INDEX", "0"))
 # Simulate how we consider a task "stuck" (in minutes)
 STALE_THRESHOLD_MINUTES = 1
 
-def get_oracle_connection():
+# Idle back-off (seconds) between polls when no tasks are found.
+# Doubles on each empty poll up to the max; resets after a task is claimed.
+IDLE_SLEEP_MIN = 0.5
+IDLE_SLEEP_MAX = 30
+
+# Number of tasks this instance processes concurrently (each holds a pooled session
+# only while recording its outcome).
+TASK_WORKERS = 8
+
+def warm_up_session(conn, requested_tag):
     """
-    Connect to Oracle using oracledb or cx_Oracle.
+    Pool session callback: runs once for each newly created session and parses
+    HOT_SQLS, so they're already in its statement cache on first real use
+    (matters after the pool grows).
     """
-    return oracledb.connect(
-        user=ORACLE_USER,
-        password=ORACLE_PASSWORD,
-        dsn=ORACLE_DSN
-    )
+    with conn.cursor() as cur:
+        for sql in HOT_SQLS:
+            cur.parse(sql)
 
-###############################################################################
-# Step 1: Fetch a Task (NOT_STARTED) for This Instance
-###############################################################################
-def fetch_next_task(conn):
-    """
-    Retrieves the next NOT_STARTED task for this instance, ordered by fileseqno or any logic.
-    Returns a dict with task info, or None if no task is found.
+# Session pool shared by the polling loop so sessions are reused across
+# iterations (and a dropped session is replaced on the next acquire).
+# Each pooled session keeps its statement cache, so repeated SQL skips the parse.
+POOL = oracledb.create_pool(
+    user=ORACLE_USER,
+    password=ORACLE_PASSWORD,
+    dsn=ORACLE_DSN,
+    min=2,
+    max=10,
+    increment=1,
+    getmode=oracledb.POOL_GETMODE_WAIT,
+    stmtcachesize=40,
+    session_callback=warm_up_session
+)
+atexit.register(POOL.close)
+
+def get_oracle_connection():
     """
-    sql = """
-        SELECT fileseqno, filename, facilityid
-          FROM tasks
-         WHERE groupid = :groupid
-           AND status = 'NOT_STARTED'
-         ORDER BY fileseqno
+    Acquire a pooled Oracle session. Closing it releases it back to POOL.
+    Every statement in this worker stands alone, so autocommit is on: the commit
+    rides along with the statement instead of costing its own round-trip.
     """
-    with conn.cursor() as cur:
-        cur.execute(sql, {"groupid": CF_INSTANCE_INDEX})
-        row = cur.fetchone()
-        if row:
-            fileseqno, filename, facilityid = row
-            return {
-                "fileseqno": fileseqno,
-                "filename": filename,
-                "facilityid": facilityid
-            }
-    return None
+    conn = POOL.acquire()
+    conn.autocommit = True
+    return conn
 
 ###############################################################################
-# Step 2: Mark Task IN_PROGRESS
+# Step 1: Claim a Batch of Tasks (NOT_STARTED -> IN_PROGRESS) for This Instance
 ###############################################################################
-def mark_in_progress(conn, fileseqno):
-    """
-    Update the status to IN_PROGRESS and record lastupdatedtime = NOW.
+FETCH_NEXT_TASKS_SQL = """
+    UPDATE tasks
+       SET status = 'IN_PROGRESS',
+           lastupdatedtime = CAST(SYSTIMESTAMP AS TIMESTAMP)
+     WHERE status = 'NOT_STARTED'
+       AND fileseqno IN (
+            SELECT fileseqno
+              FROM tasks
+             WHERE groupid = :groupid
+               AND status = 'NOT_STARTED'
+             ORDER BY fileseqno
+             FETCH FIRST :batch_size ROWS ONLY
+           )
+    RETURNING fileseqno, filename, facilityid
+         INTO :seq, :filename, :facilityid
+"""
+
+def fetch_next_tasks(conn, batch_size=10):
     """
-    sql = """
-        UPDATE tasks
-           SET status = 'IN_PROGRESS',
-               lastupdatedtime = :now
-         WHERE fileseqno = :seq
+    Atomically claims up to `batch_size` NOT_STARTED tasks for this instance (lowest
+    fileseqno first), marking them IN_PROGRESS in the same statement so two workers
+    can't pick the same row.
+    Returns a list of dicts with task info (empty if no task is found).
     """
     with conn.cursor() as cur:
-        cur.execute(sql, {
-            "seq": fileseqno,
-            "now": datetime.datetime.now()
+        seq_var = cur.var(int)
+        filename_var = cur.var(str)
+        facilityid_var = cur.var(str)
+        cur.execute(FETCH_NEXT_TASKS_SQL, {
+            "groupid": CF_INSTANCE_INDEX,
+            "batch_size": batch_size,
+            "seq": seq_var,
+            "filename": filename_var,
+            "facilityid": facilityid_var
         })
-    conn.commit()
+        claimed = cur.rowcount
+    if not claimed:
+        return []
+    # DML RETURNING binds hold one value per updated row
+    tasks = [
+        {"fileseqno": seq, "filename": filename, "facilityid": facilityid}
+        for seq, filename, facilityid in zip(
+            seq_var.getvalue(), filename_var.getvalue(), facilityid_var.getvalue()
+        )
+    ]
+    tasks.sort(key=lambda task: task["fileseqno"])
+    return tasks
 
 ###############################################################################
-# Step 3: Simulate Fetching from NAS & Normalization
+# Step 2: Simulate Fetching from NAS & Normalization
 ###############################################################################
 def process_file_from_nas(filename, facilityid):
     """
@@ -92,8 +133,16 @@ def process_file_from_nas(filename, facilityid):
     return random.random() < 0.8
 
 ###############################################################################
-# Step 4: Mark Task Success or Failure
+# Step 3: Mark Task Success or Failure
 ###############################################################################
+MARK_TASK_OUTCOME_SQL = """
+    UPDATE tasks
+       SET status = :new_status,
+           lastupdatedtime = CAST(SYSTIMESTAMP AS TIMESTAMP),
+           errordesc = :desc
+     WHERE fileseqno = :seq
+"""
+
 def mark_task_outcome(conn, fileseqno, success, error_desc=None):
     """
     If success => status=SUCCESS
@@ -101,25 +150,30 @@ def mark_task_outcome(conn, fileseqno, success, error_desc=None):
     lastupdatedtime=NOW
     """
     new_status = "SUCCESS" if success else "FAILED"
-    sql = """
-        UPDATE tasks
-           SET status = :new_status,
-               lastupdatedtime = :now,
-               errordesc = :desc
-         WHERE fileseqno = :seq
-    """
     with conn.cursor() as cur:
-        cur.execute(sql, {
+        cur.execute(MARK_TASK_OUTCOME_SQL, {
             "new_status": new_status,
             "seq": fileseqno,
-            "now": datetime.datetime.now(),
             "desc": error_desc
         })
-    conn.commit()
 
 ###############################################################################
-# Step 5: Detect & Handle Stale Tasks
+# Step 4: Detect & Handle Stale Tasks
 ###############################################################################
+# "Move" tasks stuck in IN_PROGRESS beyond the cutoff to another status or group
+# for a separate retry script, in one statement. lastupdatedtime is a plain TIMESTAMP
+# holding DB-host wall-clock time, so the cutoff is cast the same way; comparing to a
+# bare SYSTIMESTAMP would convert the column via the session time zone.
+MARK_STALE_FOR_RETRY_SQL = """
+    UPDATE tasks
+       SET status = 'NOT_STARTED',
+           groupid = 9999, -- special group for the "retry script"
+           errordesc = 'Instance died or timed out. Moved to retry.'
+     WHERE status = 'IN_PROGRESS'
+       AND lastupdatedtime < CAST(SYSTIMESTAMP AS TIMESTAMP) - NUMTODSINTERVAL(:threshold, 'MINUTE')
+    RETURNING fileseqno INTO :seq
+"""
+
 def mark_stale_tasks_for_retry(conn):
     """
     If a task is in IN_PROGRESS for more than STALE_THRESHOLD_MINUTES,
@@ -131,75 +185,106 @@ def mark_stale_tasks_for_retry(conn):
     
     Alternatively, you could set status='RETRY_NEEDED' or some other approach.
     """
-    cutoff_time = datetime.datetime.now() - datetime.timedelta(minutes=STALE_THRESHOLD_MINUTES)
+    with conn.cursor() as cur:
+        seq_var = cur.var(int)
+        cur.execute(MARK_STALE_FOR_RETRY_SQL, {"threshold": STALE_THRESHOLD_MINUTES, "seq": seq_var})
+        stuck_rows = seq_var.getvalue() if cur.rowcount else []
 
-    # Fetch tasks that are stuck in IN_PROGRESS beyond the cutoff
-    sql_select = """
-        SELECT fileseqno
-          FROM tasks
-         WHERE status = 'IN_PROGRESS'
-           AND lastupdatedtime < :cutoff
+    for fileseqno in stuck_rows:
+        print(f"[ALERT] Task {fileseqno} stale. Moved to retry script.")
+
+# Statements every worker session runs; parsed up front by warm_up_session.
+HOT_SQLS = (
+    FETCH_NEXT_TASKS_SQL,
+    MARK_TASK_OUTCOME_SQL,
+    MARK_STALE_FOR_RETRY_SQL,
+)
+
+###############################################################################
+# Step 5: Process One Task on a Worker Thread
+###############################################################################
+# NAS fetches are I/O-bound, so overlap them across threads. The semaphore counts
+# free workers; the loop reserves slots before claiming so it never holds claimed
+# (IN_PROGRESS) tasks that no worker can start yet.
+EXECUTOR = ThreadPoolExecutor(max_workers=TASK_WORKERS)
+SEM = threading.Semaphore(TASK_WORKERS)
+
+def reserve_worker_slots(max_slots):
+    """
+    Block until at least one worker is free, then take any other free ones,
+    up to max_slots. Returns the number of slots reserved.
     """
+    SEM.acquire()
+    slots = 1
+    while slots < max_slots and SEM.acquire(blocking=False):
+        slots += 1
+    return slots
 
-    # We'll "move" them to another status or group for a separate retry script
-    sql_update = """
-        UPDATE tasks
-           SET status = 'NOT_STARTED',
-               groupid = 9999, -- special group for the "retry script"
-               errordesc = 'Instance died or timed out. Moved to retry.'
-         WHERE fileseqno = :seq
+def process_one_task(task):
     """
+    Fetch/normalize the task's file, then record the outcome on a pooled session.
+    """
+    fileseqno = task["fileseqno"]
+    filename = task["filename"]
+    facilityid = task["facilityid"]
 
-    with conn.cursor() as cur:
-        cur.execute(sql_select, {"cutoff": cutoff_time})
-        stuck_rows = [r[0] for r in cur.fetchall()]
-        for fileseqno in stuck_rows:
-            print(f"[ALERT] Task {fileseqno} stale. Moving to retry script.")
-            cur.execute(sql_update, {"seq": fileseqno})
-    conn.commit()
+    # Simulate processing (fetch from NAS + normalization)
+    success = process_file_from_nas(filename, facilityid)
+
+    with get_oracle_connection() as conn:
+        if success:
+            # Mark as SUCCESS
+            mark_task_outcome(conn, fileseqno, True, error_desc=None)
+            print(f"[Instance {CF_INSTANCE_INDEX}] Task {fileseqno} SUCCESS.")
+        else:
+            # Mark as FAILED
+            mark_task_outcome(conn, fileseqno, False, error_desc="Error normalizing file.")
+            print(f"[Instance {CF_INSTANCE_INDEX}] Task {fileseqno} FAILED.")
+
+def on_task_done(future):
+    """
+    Free the worker slot and report any error raised by process_one_task.
+    """
+    SEM.release()
+    if future.exception() is not None:
+        print(f"[Instance {CF_INSTANCE_INDEX}] Task worker error: {future.exception()}")
 
 ###############################################################################
 # Main Loop
 ###############################################################################
 def main():
     print(f"Starting worker for Instance Index = {CF_INSTANCE_INDEX}")
-    conn = get_oracle_connection()
-    try:
-        while True:
-            # 1) Mark stale tasks (which belong to any instance but got stuck)
-            mark_stale_tasks_for_retry(conn)
-
-            # 2) Fetch next task for this instance
-            task = fetch_next_task(conn)
-            if not task:
-                print("No tasks for this instance. Sleeping 5s...")
-                time.sleep(5)
-                continue
-
-            fileseqno = task["fileseqno"]
-            filename = task["filename"]
-            facilityid = task["facilityid"]
-
-            print(f"[Instance {CF_INSTANCE_INDEX}] Got task fileseqno={fileseqno} => {filename}")
-
-            # 3) Mark as IN_PROGRESS
-            mark_in_progress(conn, fileseqno)
-
-            # 4) Simulate processing (fetch from NAS + normalization)
-            success = process_file_from_nas(filename, facilityid)
-
-            if success:
-                # 5) Mark as SUCCESS
-                mark_task_outcome(conn, fileseqno, True, error_desc=None)
-                print(f"[Instance {CF_INSTANCE_INDEX}] Task {fileseqno} SUCCESS.")
-            else:
-                # 5) Mark as FAILED
-                mark_task_outcome(conn, fileseqno, False, error_desc="Error normalizing file.")
-                print(f"[Instance {CF_INSTANCE_INDEX}] Task {fileseqno} FAILED.")
-
-            # Repeat until no tasks left for this instance.
-    finally:
-        conn.close()
+    idle_sleep = IDLE_SLEEP_MIN
+    while True:
+        # Wait for free workers first, then claim only as many tasks as they can start
+        slots = reserve_worker_slots(TASK_WORKERS)
+        tasks = []
+        try:
+            with get_oracle_connection() as conn:
+                # 1) Mark stale tasks (which belong to any instance but got stuck)
+                mark_stale_tasks_for_retry(conn)
+
+                # 2) Claim the next batch of tasks for this instance (already marked IN_PROGRESS)
+                tasks = fetch_next_tasks(conn, batch_size=slots)
+        finally:
+            # Give back the slots the claim didn't fill
+            if slots > len(tasks):
+                SEM.release(slots - len(tasks))
+
+        # Release the session before dispatching/idling so workers can use it.
+        if not tasks:
+            print(f"No tasks for this instance. Sleeping {idle_sleep}s...")
+            time.sleep(idle_sleep)
+            idle_sleep = min(IDLE_SLEEP_MAX, idle_sleep * 2)
+            continue
+
+        # Poll again right away; only back off once a poll comes back empty.
+        idle_sleep = IDLE_SLEEP_MIN
+
+        # 3) Hand each task to a worker thread (its slot is already reserved)
+        for task in tasks:
+            print(f"[Instance {CF_INSTANCE_INDEX}] Got task fileseqno={task['fileseqno']} => {task['filename']}")
+            EXECUTOR.submit(process_one_task, task).add_done_callback(on_task_done)
 
 if __name__ == "__main__":
     main()